@@ -1,11 +1,38 @@
 import re
+import time
+import itertools
 import datetime
 import logging
+import sys
+import threading
+
+from six.moves import queue
+
+if sys.version_info.major == 2:  # If python 2
+    from backports.functools_lru_cache import lru_cache
+else:
+    from functools import lru_cache
 
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
 except ImportError:
     boto3 = None
+    BotoConfig = None
+
+try:
+    # Retry modes (standard/adaptive) were added to botocore together with this module, in 1.15
+    import botocore.retries.adaptive
+    _BOTOCORE_SUPPORTS_RETRY_MODES = True
+except ImportError:
+    _BOTOCORE_SUPPORTS_RETRY_MODES = False
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # concurrent.futures is provided by the "futures" backport on python 2; without it, s3 is listed without
+    # prefetching or concurrency
+    ThreadPoolExecutor = None
 
 from great_expectations.exceptions import GreatExpectationsError
 from great_expectations.datasource.generator.batch_generator import BatchGenerator
@@ -14,6 +41,120 @@ from great_expectations.exceptions import BatchKwargsError
 
 logger = logging.getLogger(__name__)
 
+if hasattr(str, "removeprefix"):  # python 3.9+
+    _remove_prefix = str.removeprefix
+else:
+    def _remove_prefix(text, prefix):
+        if text.startswith(prefix):
+            return text[len(prefix):]
+        return text
+
+# The most listings (per asset and start_after) that a generator keeps cached
+_MAX_LISTING_CACHE_ENTRIES = 128
+
+# The most batch_kwargs that iter_all_assets buffers ahead of its consumer
+_ASSET_RESULT_QUEUE_SIZE = 1000
+
+_REGEX_SPECIAL_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+_REGEX_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+_REGEX_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]")
+
+
+def _scan_regex_literal(regex, start=0):
+    """Scan the literal characters of regex beginning at index start.
+
+    Returns:
+        a (literal, end) tuple, where end is the index of the first character that is not part of the literal
+    """
+    literal = []
+    i = start
+    while i < len(regex):
+        char = regex[i]
+        step = 1
+        if char == "\\":
+            if i + 1 >= len(regex) or regex[i + 1].isalnum():
+                # Character classes, backreferences and anchors such as \d or \b are not literals
+                break
+            char = regex[i + 1]
+            step = 2
+        elif char in _REGEX_SPECIAL_CHARACTERS:
+            break
+        if i + step < len(regex) and regex[i + step] in _REGEX_OPTIONAL_QUANTIFIERS:
+            # The character may be absent from a match
+            break
+        literal.append(char)
+        i += step
+    return "".join(literal), i
+
+
+def _get_regex_literal_prefix(regex):
+    """Return the literal text that every string matched by re.match(regex, ...) must begin with."""
+    if "|" in regex or _REGEX_INLINE_FLAGS.search(regex):
+        # Alternation or inline flags (e.g. case-insensitivity) may apply to the leading literal
+        return ""
+    return _scan_regex_literal(regex, 1 if regex.startswith("^") else 0)[0]
+
+
+def _build_key_filter(regex_filter, pattern):
+    """Return a predicate equivalent to pattern.match for the keys of an asset, or None if every key matches.
+
+    Filters of the form ``.*<literal>`` and ``.*<literal>$`` are common and can be checked with plain string
+    operations instead of the regex engine. Since ``.`` does not match a newline, keys containing one still use the
+    regex."""
+    if regex_filter in ("", ".*"):
+        return None
+    if not regex_filter.startswith(".*") or "|" in regex_filter or _REGEX_INLINE_FLAGS.search(regex_filter):
+        return pattern.match
+    literal, end = _scan_regex_literal(regex_filter, 2)
+    if not literal or "\n" in literal:
+        return pattern.match
+
+    if end == len(regex_filter):
+        def key_filter(key):
+            if "\n" in key:
+                return pattern.match(key) is not None
+            return literal in key
+    elif regex_filter[end:] in ("$", "\\Z"):
+        def key_filter(key):
+            if "\n" in key:
+                return pattern.match(key) is not None
+            return key.endswith(literal)
+    else:
+        return pattern.match
+    return key_filter
+
+
+def _get_s3_client_config_kwargs(max_pool_connections):
+    """Return the botocore Config options for the s3 client, limited to those the installed botocore supports."""
+    config_kwargs = {
+        "max_pool_connections": max_pool_connections,
+        "retries": {"max_attempts": 5}
+    }
+    if _BOTOCORE_SUPPORTS_RETRY_MODES:
+        config_kwargs["retries"]["mode"] = "adaptive"
+    if "tcp_keepalive" in getattr(BotoConfig, "OPTION_DEFAULTS", ()):
+        config_kwargs["tcp_keepalive"] = True
+    return config_kwargs
+
+
+def _derive_prefix_from_regex(base_prefix, regex_filter, delimiter=None):
+    """Narrow an s3 listing prefix using the literal start of the regex_filter applied to the listed keys.
+
+    The prefix is never extended past the next delimiter, since s3 groups keys into CommonPrefixes relative to the
+    requested prefix. If no narrower prefix can be derived, base_prefix is returned unchanged."""
+    try:
+        literal = _get_regex_literal_prefix(regex_filter)
+    except (TypeError, AttributeError):
+        return base_prefix
+    prefix = base_prefix or ""
+    if len(literal) <= len(prefix) or not literal.startswith(prefix):
+        return base_prefix
+    if delimiter:
+        delimiter_position = literal.find(delimiter[0], len(prefix))
+        if delimiter_position != -1:
+            literal = literal[:delimiter_position]
+    return literal if len(literal) > len(prefix) else base_prefix
+
 
 class S3Generator(BatchGenerator):
     """
@@ -34,7 +175,8 @@ class S3Generator(BatchGenerator):
                 reader_options:  # Note that reader options can be specified globally or per-asset
                   sep: ","
                 delimiter: "/"  # Note that this is the delimiter for the BUCKET KEYS. By default it is "/"
-                max_keys: 100  # The maximum number of keys to fetch in a single list_objects request to s3. When accessing batch_kwargs through an iterator, the iterator will silently refetch if more keys were available
+                list_page_size: 1000  # The number of keys to fetch in a single list_objects request to s3 (at most 1000). When accessing batch_kwargs through an iterator, the iterator will silently refetch if more keys were available. max_keys is accepted as an alias
+                listing_cache_ttl: 60  # The number of seconds for which listed keys are reused before s3 is queried again. Use 0 to disable
                 assets:
                   my_first_asset:
                     prefix: my_first_asset/
@@ -44,7 +186,10 @@ class S3Generator(BatchGenerator):
                     prefix: access_logs
                     regex_filter: access_logs/2019.*\.csv.gz
                     sep: "~"
-                    max_keys: 100
+                    list_page_size: 100
+
+    Iterators accept a ``start_after`` key to list only the keys that sort after it, for example to resume from the
+    last key listed for an asset.
     """
 
     # FIXME add tests for new partitioner functionality
@@ -56,7 +201,10 @@ class S3Generator(BatchGenerator):
                  assets=None,
                  delimiter="/",
                  reader_method=None,
-                 max_keys=1000):
+                 max_keys=None,
+                 listing_cache_ttl=60,
+                 max_pool_connections=64,
+                 list_page_size=None):
         """Initialize a new S3Generator
 
         Args:
@@ -66,7 +214,13 @@ class S3Generator(BatchGenerator):
             reader_options: options passed to the datasource reader method
             assets: asset configuration (see class docstring for more information)
             delimiter: the BUCKET KEY delimiter
-            max_keys: the maximum number of keys to fetch in a single list_objects request to s3
+            max_keys: alias for list_page_size, retained for backwards compatibility
+            listing_cache_ttl: the number of seconds for which the keys listed for an asset are reused before s3 is
+                queried again; set to 0 to disable caching
+            max_pool_connections: the size of the s3 client's connection pool, which should be at least as large as
+                the number of assets listed concurrently
+            list_page_size: the number of keys to fetch in a single list_objects request to s3; defaults to 1000,
+                the largest page s3 will return
         """
         super(S3Generator, self).__init__(name, datasource=datasource)
         if reader_options is None:
@@ -83,14 +237,59 @@ class S3Generator(BatchGenerator):
         self._bucket = bucket
         self._reader_method = reader_method
         self._reader_options = reader_options
+        self._base_reader_options_items = tuple(reader_options.items())
         self._assets = assets
         self._delimiter = delimiter
-        self._max_keys = max_keys
+        if list_page_size is None:
+            list_page_size = max_keys if max_keys is not None else 1000
+        self._list_page_size = list_page_size
         self._iterators = {}
-        try:
-            self._s3 = boto3.client('s3')
-        except TypeError:
-            raise(ImportError("Unable to load boto3, which is required for S3 generator"))
+        self._listing_cache = {}
+        self._listing_ttl = listing_cache_ttl
+        self._partition_index = {}
+        self._asset_batch_defaults = {}
+        # Memoize partition ids per generator, so that invalidation and the cache's lifetime belong to this instance
+        self._partition_impl = lru_cache(maxsize=100000)(self._compute_partition_id)
+        for asset_config in self._assets.values():
+            self._compile_asset_config(asset_config)
+        self._max_pool_connections = max_pool_connections
+        self._s3_client_lock = threading.Lock()
+
+    @staticmethod
+    def _compile_asset_config(asset_config):
+        """Precompile the regular expressions used for an asset so they are not re-parsed for every key.
+
+        Assets added after initialization are compiled on first use, and a pattern is recompiled if its source in the
+        asset config has changed since it was compiled (compiled patterns keep their source as ``pattern``)."""
+        regex_filter = asset_config.get("regex_filter", ".*")
+        compiled_regex_filter = asset_config.get("_compiled_regex_filter")
+        if compiled_regex_filter is None or compiled_regex_filter.pattern != regex_filter:
+            compiled_regex_filter = re.compile(regex_filter)
+            asset_config["_compiled_regex_filter"] = compiled_regex_filter
+            asset_config["_key_filter"] = _build_key_filter(regex_filter, compiled_regex_filter)
+        if "partition_regex" in asset_config:
+            compiled_partition_regex = asset_config.get("_compiled_partition_regex")
+            if compiled_partition_regex is None or compiled_partition_regex.pattern != asset_config["partition_regex"]:
+                asset_config["_compiled_partition_regex"] = re.compile(asset_config["partition_regex"])
+        return asset_config
+
+    @property
+    def _s3(self):
+        """The boto3 s3 client, created on first use so that generators can be configured and inspected without
+        connecting to s3."""
+        client = self.__dict__.get("_s3_client")
+        if client is None:
+            if boto3 is None:
+                raise(ImportError("Unable to load boto3, which is required for S3 generator"))
+            # boto3's default session is not thread-safe, and assets may be listed concurrently
+            with self._s3_client_lock:
+                client = self.__dict__.get("_s3_client")
+                if client is None:
+                    client = boto3.client(
+                        's3', config=BotoConfig(**_get_s3_client_config_kwargs(self._max_pool_connections))
+                    )
+                    self.__dict__["_s3_client"] = client
+        return client
 
     @property
     def reader_options(self):
@@ -107,7 +306,7 @@ class S3Generator(BatchGenerator):
     def get_available_data_asset_names(self):
         return self._assets.keys()
 
-    def _get_iterator(self, generator_asset, reader_options=None, limit=None):
+    def _get_iterator(self, generator_asset, reader_options=None, limit=None, start_after=None):
         logger.debug("Beginning S3Generator _get_iterator for generator_asset: %s" % generator_asset)
 
         if generator_asset not in self._assets:
@@ -127,9 +326,69 @@ class S3Generator(BatchGenerator):
             asset_config=asset_config,
             iterator_dict=self._iterators[generator_asset],
             reader_options=reader_options,
-            limit=limit
+            limit=limit,
+            start_after=start_after,
+            generator_asset=generator_asset
         )
 
+    def iter_all_assets(self, reader_options=None, limit=None):
+        """Yield batch_kwargs for every configured asset, listing the assets from s3 concurrently.
+
+        Args:
+            reader_options: options passed to the datasource reader method, added to each batch_kwargs
+            limit: the limit to add to each batch_kwargs
+
+        Returns:
+            An iterator of (generator_asset, batch_kwargs) tuples, interleaved across assets in the order in which
+            they become available
+        """
+        if not self._assets:
+            return
+        if ThreadPoolExecutor is None:
+            for generator_asset in self._assets:
+                for batch_kwargs in self._get_iterator(generator_asset, reader_options=reader_options, limit=limit):
+                    yield generator_asset, batch_kwargs
+            return
+
+        results = queue.Queue(maxsize=_ASSET_RESULT_QUEUE_SIZE)
+        stop = threading.Event()
+        asset_done = object()
+
+        def put_result(result):
+            # Retry with a timeout so that workers notice when the consumer has stopped reading
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def list_asset(generator_asset):
+            try:
+                for batch_kwargs in self._get_iterator(generator_asset, reader_options=reader_options, limit=limit):
+                    if not put_result((generator_asset, batch_kwargs)):
+                        return
+            finally:
+                put_result(asset_done)
+
+        with ThreadPoolExecutor(max_workers=min(32, len(self._assets))) as executor:
+            futures = [executor.submit(list_asset, generator_asset) for generator_asset in self._assets]
+            try:
+                remaining = len(futures)
+                while remaining:
+                    result = results.get()
+                    if result is asset_done:
+                        remaining -= 1
+                    else:
+                        yield result
+            finally:
+                # Stop the workers if the consumer stops early, closes the iterator, or raises
+                stop.set()
+            # Surface any exception raised while listing an asset
+            for future in futures:
+                future.result()
+
     def _build_batch_kwargs_path_iter(self, path_list, reader_options=None, limit=None):
         for path in path_list:
             yield self._build_batch_kwargs(path, reader_options=reader_options, limit=limit)
@@ -141,106 +400,273 @@ class S3Generator(BatchGenerator):
             raise GreatExpectationsError(
                 "No asset config found for asset %s" % generator_asset
             )
-        if generator_asset not in self._iterators:
-            self._iterators[generator_asset] = {}
-
-        iterator_dict = self._iterators[generator_asset]
-        batch_kwargs = None
-        for key in self._get_asset_options(generator_asset, iterator_dict):
-            if self._partitioner(key=key, asset_config=asset_config) == partition_id:
-                batch_kwargs = self._build_batch_kwargs(key=key, asset_config=asset_config,
-                                                        reader_options=reader_options, limit=limit)
-
-        if batch_kwargs is None:
+        key = self._get_partition_index(generator_asset, asset_config).get(partition_id)
+        if key is None:
             raise BatchKwargsError(
                 "Unable to identify partition %s for asset %s" % (partition_id, generator_asset),
-               {
-                    generator_asset: generator_asset,
-                    partition_id: partition_id
+                {
+                    "generator_asset": generator_asset,
+                    "partition_id": partition_id
                 }
             )
 
-        return batch_kwargs
+        return self._build_batch_kwargs(key=key, asset_config=asset_config,
+                                        reader_options=reader_options, limit=limit,
+                                        generator_asset=generator_asset)
+
+    def _get_partition_index(self, generator_asset, asset_config):
+        """Return a mapping from partition_id to key for an asset.
+
+        The index is kept only alongside a cached listing and is rebuilt whenever the listing is refetched, so it
+        follows the listing cache."""
+        if generator_asset not in self._iterators:
+            self._iterators[generator_asset] = {}
+        keys = self._get_asset_options(asset_config, self._iterators[generator_asset])
 
-    def _build_batch_kwargs(self, key, asset_config=None, reader_options=None, limit=None):
-        batch_kwargs = {"s3": "s3a://" + self.bucket + "/" + key, 'reader_options': self.reader_options}
+        cached = self._partition_index.get(generator_asset)
+        if cached is not None and cached[0] is keys:
+            return cached[1]
+
+        fallback_ids = self._iter_fallback_partition_ids()
+        partitioner = self._partitioner
+        partition_index = {}
+        add_partition = partition_index.setdefault
+        for key in keys:
+            # Keep the first key for each partition_id
+            add_partition(partitioner(key, asset_config, fallback_ids), key)
+
+        # A listing read through on a cache miss is cached once it is exhausted; without caching there is nothing
+        # to key the index on
+        listing = None
+        if self._listing_ttl:
+            listing = self._get_cached_listing(self._get_listing_cache_key(asset_config) + (None,))
+        if listing is not None:
+            self._partition_index[generator_asset] = (listing, partition_index)
+        else:
+            self._partition_index.pop(generator_asset, None)
+        return partition_index
+
+    def _get_asset_batch_defaults(self, asset_config, generator_asset=None):
+        """Return the reader_options and reader_method to use for every key of an asset, merging the generator-level
+        and asset-level configuration once per named asset rather than for each key."""
+        cached = self._asset_batch_defaults.get(generator_asset) if generator_asset is not None else None
+        if cached is not None and cached[0] is asset_config:
+            return cached[1]
+
+        asset_reader_options = dict(self._base_reader_options_items)
         if asset_config.get("reader_options"):
-            batch_kwargs['reader_options'].update(asset_config.get("reader_options"))
+            asset_reader_options.update(asset_config["reader_options"])
+
+        if asset_config.get("reader_method"):
+            reader_method = ReaderMethods(asset_config["reader_method"])
+        elif self._reader_method is not None:
+            reader_method = ReaderMethods(self._reader_method)
+        else:
+            reader_method = None
+
+        batch_defaults = (asset_reader_options, reader_method)
+        if generator_asset is not None:
+            self._asset_batch_defaults[generator_asset] = (asset_config, batch_defaults)
+        return batch_defaults
+
+    def _build_batch_kwargs(self, key, asset_config=None, reader_options=None, limit=None, generator_asset=None):
+        asset_reader_options, reader_method = self._get_asset_batch_defaults(asset_config, generator_asset)
+        batch_kwargs = {
+            "s3": "s3a://%s/%s" % (self._bucket, key),
+            "reader_options": dict(asset_reader_options)
+        }
         if reader_options is not None:
             batch_kwargs['reader_options'].update(reader_options)
 
-        if self._reader_method is not None:
-            batch_kwargs["reader_method"] = ReaderMethods(self._reader_method)
-        if asset_config.get("reader_method"):
-            batch_kwargs['reader_method'] = ReaderMethods(asset_config.get("reader_method"))
+        if reader_method is not None:
+            batch_kwargs["reader_method"] = reader_method
 
         if limit:
             batch_kwargs['limit'] = limit
 
         return S3BatchKwargs(batch_kwargs)
 
-    def _get_asset_options(self, asset_config, iterator_dict):
+    def _get_list_page_size(self, asset_config):
+        if "list_page_size" in asset_config:
+            return asset_config["list_page_size"]
+        return asset_config.get("max_keys", self._list_page_size)
+
+    def _get_listing_cache_key(self, asset_config):
+        return (
+            self.bucket,
+            asset_config.get("prefix", None),
+            asset_config.get("delimiter", self._delimiter),
+            asset_config.get("regex_filter", ".*"),
+            asset_config.get("directory_assets", False)
+        )
+
+    def invalidate_listing_cache(self, generator_asset=None):
+        """Discard cached s3 listings so that the next request for keys queries s3 again.
+
+        Args:
+            generator_asset: the asset whose listing should be discarded. If None, all listings are discarded.
+        """
+        if generator_asset is None:
+            self._listing_cache = {}
+            self._partition_index = {}
+        elif generator_asset in self._assets:
+            cache_key = self._get_listing_cache_key(self._assets[generator_asset])
+            for key in [key for key in self._listing_cache if key[:-1] == cache_key]:
+                del self._listing_cache[key]
+            self._partition_index.pop(generator_asset, None)
+        self._partition_impl.cache_clear()
+
+    def _get_asset_options(self, asset_config, iterator_dict, start_after=None):
+        # Pagination state is handled by the boto3 paginator; iterator_dict records the last key listed from s3 so
+        # that a later listing can resume from it using start_after
+        if not self._listing_ttl:
+            return self._list_asset_keys(asset_config, iterator_dict, start_after=start_after)
+
+        cache_key = self._get_listing_cache_key(asset_config) + (start_after,)
+        keys = self._get_cached_listing(cache_key)
+        if keys is not None:
+            return keys
+
+        # Keys are handed to the caller page by page while the cache is filled, so the first batch is available as
+        # soon as the first page arrives
+        return self._list_asset_keys(asset_config, iterator_dict, start_after=start_after, cache_key=cache_key)
+
+    def _get_cached_listing(self, cache_key):
+        cached = self._listing_cache.get(cache_key)
+        if cached is None:
+            return None
+        if time.time() - cached[1] >= self._listing_ttl:
+            self._listing_cache.pop(cache_key, None)
+            return None
+        return cached[0]
+
+    def _store_listing(self, cache_key, keys):
+        """Add a complete listing to the cache, dropping expired listings and, if the cache is full, the oldest."""
+        now = time.time()
+        entries = [
+            (listed_at, key) for key, (_, listed_at) in list(self._listing_cache.items())
+        ]
+        entries.sort()
+        expired = [key for listed_at, key in entries if now - listed_at >= self._listing_ttl]
+        live = [key for listed_at, key in entries if now - listed_at < self._listing_ttl and key != cache_key]
+        overflow = live[:max(0, len(live) - _MAX_LISTING_CACHE_ENTRIES + 1)]
+        for key in expired + overflow:
+            self._listing_cache.pop(key, None)
+        self._listing_cache[cache_key] = (keys, now)
+
+    def _cache_pages(self, cache_key, pages):
+        """Pass pages of keys through while collecting them, caching the listing once every page has been read."""
+        listing = []
+        for page_keys in pages:
+            page_keys = list(page_keys)
+            listing.extend(page_keys)
+            yield page_keys
+        self._store_listing(cache_key, listing)
+
+    def _list_asset_keys(self, asset_config, iterator_dict=None, start_after=None, cache_key=None):
+        pages = self._iter_asset_key_pages(asset_config, iterator_dict, start_after=start_after)
+        if cache_key is not None:
+            pages = self._cache_pages(cache_key, pages)
+        return itertools.chain.from_iterable(pages)
+
+    def _iter_asset_key_pages(self, asset_config, iterator_dict=None, start_after=None):
+        """Yield an iterable of the matching keys from each page of the s3 listing for an asset."""
+        self._compile_asset_config(asset_config)
+        delimiter = asset_config.get("delimiter", self._delimiter)
         query_options = {
             "Bucket": self.bucket,
-            "Delimiter": asset_config.get("delimiter", self._delimiter),
-            "Prefix": asset_config.get("prefix", None),
-            "MaxKeys": asset_config.get("max_keys", self._max_keys)
+            "Delimiter": delimiter,
+            "Prefix": _derive_prefix_from_regex(
+                asset_config.get("prefix", None),
+                asset_config.get("regex_filter", ".*"),
+                delimiter
+            )
         }
+        if start_after is not None:
+            query_options["StartAfter"] = start_after
+        # A missing section only indicates a misconfigured asset when listing the full asset from its configured
+        # prefix; after resuming or narrowing the prefix it just means that no keys match
+        allow_empty = start_after is not None or query_options["Prefix"] != asset_config.get("prefix", None)
         directory_assets = asset_config.get("directory_assets", False)
+        key_filter = asset_config["_key_filter"]
 
-        if "continuation_token" in iterator_dict:
-            query_options.update({
-                "ContinuationToken": iterator_dict["continuation_token"]
-            })
-
-        logger.debug("Fetching objects from S3 with query options: %s" % str(query_options))
-        asset_options = self._s3.list_objects_v2(**query_options)
-        if directory_assets:
-            if "CommonPrefixes" not in asset_options:
-                raise BatchKwargsError(
-                    "Unable to build batch_kwargs. The asset may not be configured correctly. If dictionary assets "
-                    "are requested, then common prefixes must be returned.",
-                    {
-                        "asset_configuration": asset_config,
-                        "contents": asset_options["Contents"] if "Contents" in asset_options else None
-                    }
-                )
-            keys = [item["Prefix"] for item in asset_options["CommonPrefixes"]]
-        else:
-            if "Contents" not in asset_options:
-                raise BatchKwargsError(
-                    "Unable to build batch_kwargs. The asset may not be configured correctly. If s3 returned common "
-                    "prefixes it may not have been able to identify desired keys, and they are included in the "
-                    "incomplete batch_kwargs object returned with this error.",
-                    {
-                        "asset_configuration": asset_config,
-                        "common_prefixes": asset_options["CommonPrefixes"]
-                        if "CommonPrefixes" in asset_options else None
-                    }
-                )
-            keys = [item["Key"] for item in asset_options["Contents"] if item["Size"] > 0]
-
-        keys = [key for key in
-                filter(lambda x: re.match(asset_config.get("regex_filter", ".*"), x) is not None, keys)]
-        for key in keys:
-            yield key
-
-        if asset_options["IsTruncated"]:
-            iterator_dict["continuation_token"] = asset_options["NextContinuationToken"]
-            # Recursively fetch more
-            for key in self._get_asset_options(asset_config, iterator_dict):
-                yield key
-        elif "continuation_token" in iterator_dict:
-            # Make sure we clear the token once we've gotten fully through
-            del iterator_dict["continuation_token"]
-
-    def _build_asset_iterator(self, asset_config, iterator_dict, reader_options=None, limit=None):
-        for key in self._get_asset_options(asset_config, iterator_dict):
-            yield self._build_batch_kwargs(
+        paginator = self._s3.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            PaginationConfig={"PageSize": self._get_list_page_size(asset_config)},
+            **query_options
+        )
+        for asset_options in self._prefetch_pages(pages):
+            logger.debug("Fetched objects from S3 with query options: %s" % str(query_options))
+            if directory_assets:
+                if "CommonPrefixes" not in asset_options:
+                    if allow_empty:
+                        continue
+                    raise BatchKwargsError(
+                        "Unable to build batch_kwargs. The asset may not be configured correctly. If dictionary "
+                        "assets are requested, then common prefixes must be returned.",
+                        {
+                            "asset_configuration": asset_config,
+                            "contents": asset_options["Contents"] if "Contents" in asset_options else None
+                        }
+                    )
+                items = asset_options["CommonPrefixes"]
+                if iterator_dict is not None and items:
+                    iterator_dict["last_key"] = items[-1]["Prefix"]
+                keys = (item["Prefix"] for item in items)
+            else:
+                if "Contents" not in asset_options:
+                    if allow_empty:
+                        continue
+                    raise BatchKwargsError(
+                        "Unable to build batch_kwargs. The asset may not be configured correctly. If s3 returned "
+                        "common prefixes it may not have been able to identify desired keys, and they are included "
+                        "in the incomplete batch_kwargs object returned with this error.",
+                        {
+                            "asset_configuration": asset_config,
+                            "common_prefixes": asset_options["CommonPrefixes"]
+                            if "CommonPrefixes" in asset_options else None
+                        }
+                    )
+                items = asset_options["Contents"]
+                if iterator_dict is not None and items:
+                    iterator_dict["last_key"] = items[-1]["Key"]
+                # Zero-byte objects (such as directory markers) are skipped before any regex work
+                keys = (item["Key"] for item in items if item.get("Size", 0) > 0)
+
+            if key_filter is not None:
+                keys = filter(key_filter, keys)
+            yield keys
+
+    @staticmethod
+    def _prefetch_pages(pages):
+        """Iterate over pages of an S3 listing, requesting the next page in the background while the current page
+        is consumed, so that S3 round trips overlap with downstream work. At most one page is fetched ahead."""
+        page_iterator = iter(pages)
+        if ThreadPoolExecutor is None:
+            for page in page_iterator:
+                yield page
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(next, page_iterator, None)
+            while True:
+                page = next_page.result()
+                if page is None:
+                    return
+                next_page = executor.submit(next, page_iterator, None)
+                yield page
+
+    def _build_asset_iterator(self, asset_config, iterator_dict, reader_options=None, limit=None, start_after=None,
+                              generator_asset=None):
+        # Bind the per-key method to a local; this loop runs once for every listed key
+        build_batch_kwargs = self._build_batch_kwargs
+        for key in self._get_asset_options(asset_config, iterator_dict, start_after=start_after):
+            yield build_batch_kwargs(
                 key,
                 asset_config,
                 reader_options=reader_options,
-                limit=limit
+                limit=limit,
+                generator_asset=generator_asset
             )
 
     def get_available_partition_ids(self, generator_asset):
@@ -248,32 +674,67 @@ class S3Generator(BatchGenerator):
             self._iterators[generator_asset] = {}
         iterator_dict = self._iterators[generator_asset]
         asset_config = self._assets[generator_asset]
+        fallback_ids = self._iter_fallback_partition_ids()
+        partitioner = self._partitioner
         available_ids = [
-            self._partitioner(key=key, asset_config=asset_config)
-            for key in self._get_asset_options(generator_asset, iterator_dict)
+            partitioner(key, asset_config, fallback_ids)
+            for key in self._get_asset_options(asset_config, iterator_dict)
         ]
         return available_ids
 
-    def _partitioner(self, key, asset_config):
-        if "partition_regex" in asset_config:
-            match_group_id = asset_config.get("match_group_id", 1)
-            matches = re.match(asset_config["partition_regex"], key)
-            # In the case that there is a defined regex, the user *wanted* a partition. But it didn't match.
-            # So, we'll add a *sortable* id
+    @staticmethod
+    def _iter_fallback_partition_ids():
+        """Yield sortable, unique ids to use in place of a partition_id for keys that do not match the
+        partition_regex.
+
+        The timestamp is formatted once per listing rather than for each unmatched key; a counter keeps the ids
+        unique within the listing."""
+        timestamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S.%fZ")
+        for count in itertools.count():
+            yield "%s_%09d" % (timestamp, count)
+
+    @staticmethod
+    def _compute_partition_id(partition_pattern, match_group_id, prefix, key):
+        """Compute the partition_id for a key. Each generator memoizes this as _partition_impl.
+
+        Returns:
+            a (partition_id, unmatched_suffix) tuple; unmatched_suffix is None unless the key could not be partitioned
+        """
+        if partition_pattern is not None:
+            matches = partition_pattern.match(key)
             if matches is None:
-                logger.warning("No match found for key: %s" % key)
-                return datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S.%fZ") + "__unmatched"
-            else:
-                try:
-                    return matches.group(match_group_id)
-                except IndexError:
-                    logger.warning("No match group %d in key %s" % (match_group_id, key))
-                    return datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S.%fZ") + "__no_match_group"
+                return None, "__unmatched"
+            try:
+                return matches.group(match_group_id), None
+            except IndexError:
+                return None, "__no_match_group"
 
         # If there is no partitioner defined, fall back on using the path as a partition_id
+        return _remove_prefix(key, prefix), None
+
+    def _partitioner(self, key, asset_config, fallback_ids=None):
+        if "partition_regex" in asset_config:
+            partition_pattern = asset_config.get("_compiled_partition_regex")
+            if partition_pattern is None or partition_pattern.pattern != asset_config["partition_regex"]:
+                partition_pattern = self._compile_asset_config(asset_config)["_compiled_partition_regex"]
+            match_group_id = asset_config.get("match_group_id", 1)
+            prefix = None
         else:
+            partition_pattern = None
+            match_group_id = None
             prefix = asset_config.get("prefix", "")
-            if key.startswith(prefix):
-                key = key[len(prefix):]
-            return key
+
+        partition_id, unmatched_suffix = self._partition_impl(partition_pattern, match_group_id, prefix, key)
+        if unmatched_suffix is None:
+            return partition_id
+
+        # In the case that there is a defined regex, the user *wanted* a partition. But it didn't match.
+        # So, we'll add a *sortable* id
+        if unmatched_suffix == "__unmatched":
+            logger.warning("No match found for key: %s" % key)
+        else:
+            logger.warning("No match group %s in key %s" % (match_group_id, key))
+        if fallback_ids is None:
+            fallback_ids = self._iter_fallback_partition_ids()
+        return next(fallback_ids) + unmatched_suffix
 
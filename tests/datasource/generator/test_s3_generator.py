@@ -1,11 +1,18 @@
 import pytest
 from moto import mock_s3
 
+import re
 import logging
+import threading
 import pandas as pd
 import boto3
 
-from great_expectations.datasource.generator.s3_generator import S3Generator
+from great_expectations.datasource.generator.s3_generator import (
+    S3Generator,
+    _build_key_filter,
+    _derive_prefix_from_regex,
+    _get_s3_client_config_kwargs
+)
 from great_expectations.exceptions import BatchKwargsError
 
 
@@ -101,7 +108,7 @@ def test_s3_generator_basic_operation(s3_generator):
 def test_s3_generator_incremental_fetch(s3_generator, caplog):
     caplog.set_level(logging.DEBUG, logger="great_expectations.datasource.generator.s3_generator")
 
-    # When max_keys is not set, it defaults to 1000, so all items are returned in the first iterator batch,
+    # When list_page_size is not set, it defaults to 1000, so all items are returned in the first iterator batch,
     # causing only one fetch (and one log entry referencing the startup of the method)
     caplog.clear()
     batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
@@ -117,6 +124,15 @@ def test_s3_generator_incremental_fetch(s3_generator, caplog):
     assert len(caplog.records) == 4
     assert len(batch_kwargs) == 3
 
+    # list_page_size takes precedence over the max_keys alias
+    s3_generator.assets["other_empty_delimiter"]["list_page_size"] = 2
+    s3_generator.invalidate_listing_cache()
+    s3_generator.reset_iterator("other_empty_delimiter")
+    caplog.clear()
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("other_empty_delimiter")]
+    assert len(caplog.records) == 2
+    assert len(batch_kwargs) == 3
+
 
 def test_s3_generator_get_directories(s3_generator):
     # Verify that an asset configured to return directories can do so
@@ -129,3 +145,276 @@ def test_s3_generator_get_directories(s3_generator):
 def test_s3_generator_limit(s3_generator):
     batch_kwargs_list = [kwargs for kwargs in s3_generator.get_iterator("data", limit=10)]
     assert all(["limit" in batch_kwargs for batch_kwargs in batch_kwargs_list])
+
+
+def test_s3_generator_listing_cache(s3_generator, caplog):
+    caplog.set_level(logging.DEBUG, logger="great_expectations.datasource.generator.s3_generator")
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert len(batch_kwargs) == 2
+
+    # A second pass over the same asset is served from the listing cache without querying s3
+    caplog.clear()
+    s3_generator.reset_iterator("data")
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert len(batch_kwargs) == 2
+    assert len(caplog.records) == 1
+
+    # Invalidating the cache forces a refetch
+    caplog.clear()
+    s3_generator.invalidate_listing_cache("data")
+    s3_generator.reset_iterator("data")
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert len(batch_kwargs) == 2
+    assert len(caplog.records) == 2
+
+
+def test_s3_generator_does_not_mutate_reader_options(s3_generator):
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("other_empty_delimiter")]
+    assert all([kwargs["reader_options"]["sep"] == "\t" for kwargs in batch_kwargs])
+
+    # Asset-level reader_options must not leak into the generator defaults or other assets
+    assert s3_generator.reader_options == {"sep": ","}
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert all([kwargs["reader_options"]["sep"] == "," for kwargs in batch_kwargs])
+
+
+def test_derive_prefix_from_regex():
+    # The literal start of the regex narrows the prefix, but never past the next delimiter
+    assert _derive_prefix_from_regex("data/", r"data/for/.*\.csv", "") == "data/for/"
+    assert _derive_prefix_from_regex("data/", r"data/for/.*\.csv", "/") == "data/for"
+    assert _derive_prefix_from_regex("", r"^access_logs/2019.*\.csv.gz", "") == "access_logs/2019"
+    assert _derive_prefix_from_regex(None, r"logs\.d/file", "/") == "logs.d"
+
+    # Optional characters, classes, alternation and inline flags leave the prefix untouched
+    assert _derive_prefix_from_regex("data/", r"data/fors?/", "") == "data/for"
+    assert _derive_prefix_from_regex("data/", r"data/\d+", "") == "data/"
+    assert _derive_prefix_from_regex("data/", r"data/for|other", "") == "data/"
+    assert _derive_prefix_from_regex("data/", r"(?i)data/for/", "") == "data/"
+    assert _derive_prefix_from_regex("data/", r".*/you\.csv", "/") == "data/"
+    assert _derive_prefix_from_regex("other/", r"data/for/", "") == "other/"
+    assert _derive_prefix_from_regex(None, r".*", "/") is None
+
+
+def test_s3_generator_partition_ids(mock_s3_bucket):
+    generator = S3Generator("my_generator",
+                            datasource=None,
+                            bucket=mock_s3_bucket,
+                            assets={
+                                "data": {
+                                    "prefix": "data/",
+                                    "delimiter": "",
+                                    "regex_filter": r"data/for/.*\.csv"
+                                },
+                                "data_partitioned": {
+                                    "prefix": "data/",
+                                    "delimiter": "",
+                                    "regex_filter": r"data/.*\.csv",
+                                    "partition_regex": r"data/(for|to)/you\.csv"
+                                }
+                            })
+    partition_ids = generator.get_available_partition_ids("data_partitioned")
+    assert len(partition_ids) == 4
+    assert {"for", "to"} < set(partition_ids)
+    # Keys that do not match the partition_regex each get a unique, sortable fallback id
+    unmatched = [partition_id for partition_id in partition_ids if partition_id.endswith("__unmatched")]
+    assert len(unmatched) == 2
+    assert len(set(partition_ids)) == 4
+
+    batch_kwargs = generator.build_batch_kwargs_from_partition_id("data_partitioned", "to")
+    assert batch_kwargs["s3"] == "s3a://test_bucket/data/to/you.csv"
+
+    # Without a partition_regex, the key relative to the prefix is used as the partition_id
+    assert set(generator.get_available_partition_ids("data")) == {"for/you.csv", "for/me.csv"}
+
+    # Partition ids are memoized per generator; invalidating one generator leaves others untouched
+    other_generator = S3Generator("other_generator", bucket=mock_s3_bucket, assets=generator.assets)
+    other_generator.get_available_partition_ids("data")
+    assert generator._partition_impl.cache_info().currsize > 0
+    other_generator.invalidate_listing_cache()
+    assert other_generator._partition_impl.cache_info().currsize == 0
+    assert generator._partition_impl.cache_info().currsize > 0
+
+    with pytest.raises(BatchKwargsError):
+        generator.build_batch_kwargs_from_partition_id("data_partitioned", "is")
+
+    # The index is kept with the cached listing, and not kept at all when listings are not cached
+    assert generator._partition_index["data_partitioned"][0] is generator._get_cached_listing(
+        generator._get_listing_cache_key(generator.assets["data_partitioned"]) + (None,)
+    )
+    generator._listing_ttl = 0
+    batch_kwargs = generator.build_batch_kwargs_from_partition_id("data_partitioned", "for")
+    assert batch_kwargs["s3"] == "s3a://test_bucket/data/for/you.csv"
+    assert "data_partitioned" not in generator._partition_index
+
+
+def test_s3_generator_iter_all_assets(mock_s3_bucket, s3_generator, monkeypatch):
+    active_threads = threading.active_count()
+    generator = S3Generator("my_generator",
+                            datasource=None,
+                            bucket=mock_s3_bucket,
+                            assets={
+                                "data": {
+                                    "prefix": "data/",
+                                    "delimiter": "",
+                                    "regex_filter": r"data/for/.*\.csv"
+                                },
+                                "data_dirs": {
+                                    "prefix": "data/",
+                                    "directory_assets": True
+                                }
+                            })
+    results = [result for result in generator.iter_all_assets(limit=10)]
+    assert len(results) == 5
+    assert {generator_asset for generator_asset, _ in results} == {"data", "data_dirs"}
+    assert all([batch_kwargs["limit"] == 10 for _, batch_kwargs in results])
+
+    # Closing the iterator early stops the workers instead of waiting for every asset to be listed
+    monkeypatch.setattr("great_expectations.datasource.generator.s3_generator._ASSET_RESULT_QUEUE_SIZE", 1)
+    results = generator.iter_all_assets()
+    next(results)
+    results.close()
+    assert threading.active_count() == active_threads
+
+    # Errors from any asset are raised once the other assets have been listed
+    with pytest.raises(BatchKwargsError):
+        [result for result in s3_generator.iter_all_assets()]
+
+
+def test_s3_generator_start_after(s3_generator):
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert len(batch_kwargs) == 2
+    # The last key listed from s3 is recorded so a later listing can resume from it
+    assert s3_generator._iterators["data"]["last_key"] == "data/for/you.csv"
+
+    batch_kwargs = [kwargs for kwargs in s3_generator._get_iterator("data", start_after="data/for/me.csv")]
+    assert [kwargs["s3"] for kwargs in batch_kwargs] == ["s3a://test_bucket/data/for/you.csv"]
+
+    batch_kwargs = [kwargs for kwargs in s3_generator._get_iterator("data", start_after="data/for/you.csv")]
+    assert batch_kwargs == []
+
+
+def test_build_key_filter_matches_regex():
+    keys = [
+        "data/for/you.csv",
+        "data/for/you.csv.gz",
+        "data/for/you.csvx",
+        "data/for/you_csv",
+        "data/for\nyou.csv",
+        "data/for/you.csv\n",
+        ""
+    ]
+    for regex_filter in [".*", "", r".*\.csv", r".*\.csv$", r".*\.csv\Z", r".*/you\.csv", r".*\.csv.gz",
+                         r"data/for/.*\.csv", r".*\.cs?v", r".*[0-9]"]:
+        pattern = re.compile(regex_filter)
+        key_filter = _build_key_filter(regex_filter, pattern)
+        if key_filter is None:
+            key_filter = lambda key: True
+        for key in keys:
+            assert bool(key_filter(key)) == (pattern.match(key) is not None), (regex_filter, key)
+
+    # Simple filters avoid the regex engine entirely
+    assert _build_key_filter(".*", re.compile(".*")) is None
+    assert _build_key_filter(r"data/.*", re.compile(r"data/.*")) == re.compile(r"data/.*").match
+
+
+def test_s3_generator_creates_client_lazily(s3_generator):
+    # Inspecting configured assets does not require an s3 client
+    assert set(s3_generator.get_available_data_asset_names()) == set(s3_generator.assets.keys())
+    assert "_s3_client" not in s3_generator.__dict__
+
+    [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert "_s3_client" in s3_generator.__dict__
+
+
+def test_s3_generator_recompiles_changed_regex_filter(s3_generator):
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert len(batch_kwargs) == 2
+
+    # Changing the regex_filter of a configured asset takes effect on the next listing
+    s3_generator.assets["data"]["regex_filter"] = r"data/to/.*\.csv"
+    s3_generator.reset_iterator("data")
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("data")]
+    assert [kwargs["s3"] for kwargs in batch_kwargs] == ["s3a://test_bucket/data/to/you.csv"]
+
+
+def test_s3_generator_without_thread_pool(s3_generator, monkeypatch):
+    monkeypatch.setattr("great_expectations.datasource.generator.s3_generator.ThreadPoolExecutor", None)
+    batch_kwargs = [kwargs for kwargs in s3_generator.get_iterator("other_empty_delimiter")]
+    assert len(batch_kwargs) == 3
+
+    # Assets are listed one after another instead of concurrently
+    s3_generator.assets.pop("other")
+    results = [result for result in s3_generator.iter_all_assets()]
+    assert {generator_asset for generator_asset, _ in results} == set(s3_generator.assets.keys())
+
+
+def test_s3_generator_listing_cache_streams_and_evicts(s3_generator, caplog):
+    caplog.set_level(logging.DEBUG, logger="great_expectations.datasource.generator.s3_generator")
+
+    # The first batch is available before every page has been listed
+    caplog.clear()
+    batch_kwargs_iterator = s3_generator.get_iterator("other_empty_delimiter")
+    next(batch_kwargs_iterator)
+    assert len(caplog.records) == 2
+    # A listing that was not read to the end is not cached
+    assert s3_generator._listing_cache == {}
+    [kwargs for kwargs in batch_kwargs_iterator]
+    assert len(s3_generator._listing_cache) == 1
+
+    # Expired listings are dropped when a new listing is cached
+    s3_generator._listing_ttl = 0.01
+    s3_generator._listing_cache = {("expired",): ([], 0)}
+    [kwargs for kwargs in s3_generator._get_iterator("data", start_after="data/for/me.csv")]
+    assert ("expired",) not in s3_generator._listing_cache
+    assert len(s3_generator._listing_cache) == 1
+
+
+def test_s3_generators_sharing_assets_keep_their_own_reader_options(mock_s3_bucket):
+    assets = {
+        "data": {
+            "prefix": "data/",
+            "delimiter": "",
+            "regex_filter": r"data/for/.*\.csv"
+        }
+    }
+    comma_generator = S3Generator("comma", bucket=mock_s3_bucket, reader_options={"sep": ","}, assets=assets)
+    pipe_generator = S3Generator("pipe", bucket=mock_s3_bucket, reader_options={"sep": "|"}, assets=assets)
+
+    assert all([kwargs["reader_options"]["sep"] == "," for kwargs in comma_generator.get_iterator("data")])
+    assert all([kwargs["reader_options"]["sep"] == "|" for kwargs in pipe_generator.get_iterator("data")])
+    assert "_batch_defaults" not in assets["data"]
+
+
+def test_s3_generator_client_config(s3_generator, monkeypatch):
+    # The client is built with the real botocore Config
+    client = s3_generator._s3
+    assert client.meta.config.max_pool_connections == 64
+    assert client.meta.config.retries["mode"] == "adaptive"
+
+    # Options unknown to older botocore releases are left out
+    monkeypatch.setattr("great_expectations.datasource.generator.s3_generator._BOTOCORE_SUPPORTS_RETRY_MODES", False)
+    monkeypatch.setattr("botocore.config.Config.OPTION_DEFAULTS", {"max_pool_connections": None, "retries": None})
+    assert _get_s3_client_config_kwargs(10) == {"max_pool_connections": 10, "retries": {"max_attempts": 5}}
+
+
+def test_s3_generator_narrowed_prefix_without_matches(mock_s3_bucket):
+    # The regex_filter narrows the listing prefix to data/zz, under which there are no keys. As when listing the
+    # configured prefix, an asset without matching keys yields nothing rather than raising
+    generator = S3Generator("my_generator",
+                            datasource=None,
+                            bucket=mock_s3_bucket,
+                            assets={
+                                "data": {
+                                    "prefix": "data/",
+                                    "delimiter": "/",
+                                    "regex_filter": r"data/zz.*\.csv"
+                                },
+                                "data_dirs": {
+                                    "prefix": "data/",
+                                    "directory_assets": True,
+                                    "regex_filter": r"data/zz.*"
+                                }
+                            })
+    assert [kwargs for kwargs in generator.get_iterator("data")] == []
+    assert [kwargs for kwargs in generator.get_iterator("data_dirs")] == []
+    assert generator.get_available_partition_ids("data") == []